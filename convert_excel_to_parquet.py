@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+import numpy as np
+
+# --- Configuración global ---
+# Libro de Excel de origen y carpeta donde se guarda una copia en Parquet de cada hoja.
+EXCEL_FILE_PATH = "Proccess_irradiance_data_2013_2023.xlsx"
+PARQUET_DIR = "parquet"
+PARQUET_COMPRESSION = "zstd"
+
+# --- Funciones ---
+
+def parquet_path(sheet_name: str, parquet_dir: str = PARQUET_DIR) -> str:
+    """
+    Devuelve la ruta del archivo Parquet que corresponde a una hoja del libro de Excel.
+
+    Args:
+        sheet_name (str): Nombre de la hoja (ej., "Enero").
+        parquet_dir (str): Carpeta donde se guardan los archivos Parquet.
+
+    Returns:
+        str: Ruta al archivo Parquet de la hoja.
+    """
+    return os.path.join(parquet_dir, f"{sheet_name}.parquet")
+
+def is_parquet_up_to_date(file_path: str, sheet_name: str, parquet_dir: str = PARQUET_DIR) -> bool:
+    """
+    Indica si la copia en Parquet de una hoja existe y no es más antigua que el libro de Excel.
+
+    Args:
+        file_path (str): Ruta al archivo Excel de origen.
+        sheet_name (str): Nombre de la hoja (ej., "Enero").
+        parquet_dir (str): Carpeta donde se guardan los archivos Parquet.
+
+    Returns:
+        bool: True si se puede leer la hoja desde Parquet sin perder cambios del Excel.
+    """
+    sheet_parquet_path = parquet_path(sheet_name, parquet_dir)
+    if not os.path.exists(sheet_parquet_path):
+        return False
+    # Sin el Excel de origen no hay nada más reciente: la copia en Parquet es la única fuente
+    if not os.path.exists(file_path):
+        return True
+    return os.path.getmtime(sheet_parquet_path) >= os.path.getmtime(file_path)
+
+def convert_excel_to_parquet(file_path: str, parquet_dir: str = PARQUET_DIR) -> list:
+    """
+    Convierte cada hoja del libro de Excel en un archivo Parquet independiente.
+
+    Leer el Excel con openpyxl es muy lento; basta con hacerlo una vez y luego
+    cargar los datos desde Parquet, que es un formato binario por columnas.
+
+    Args:
+        file_path (str): Ruta al archivo Excel.
+        parquet_dir (str): Carpeta de destino para los archivos Parquet.
+
+    Returns:
+        list: Rutas de los archivos Parquet generados.
+    """
+    os.makedirs(parquet_dir, exist_ok=True)
+
+    written_paths = []
+    with pd.ExcelFile(file_path) as excel_file:
+        for sheet_name in excel_file.sheet_names:
+            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            # Parquet solo admite nombres de columna de tipo texto (los años se leen como enteros)
+            df.columns = df.columns.astype(str)
+            # Los años (desde la tercera columna) se guardan en float32, igual que al cargarlos
+            df[df.columns[2:]] = df.iloc[:, 2:].astype(np.float32)
+
+            output_path = parquet_path(sheet_name, parquet_dir)
+            df.to_parquet(output_path, engine="pyarrow", compression=PARQUET_COMPRESSION)
+            written_paths.append(output_path)
+            print(f"Hoja '{sheet_name}' guardada como '{output_path}'.")
+
+    return written_paths
+
+# --- Bloque principal de ejecución ---
+if __name__ == "__main__":
+    convert_excel_to_parquet(EXCEL_FILE_PATH)
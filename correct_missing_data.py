@@ -1,7 +1,68 @@
 import pandas as pd
 import numpy as np
 
-def fill_missing_irradiance_data(df: pd.DataFrame) -> pd.DataFrame:
+def _fill_row_means_numpy(block: np.ndarray) -> None:
+    """
+    Rellena en el lugar los NaN de cada fila de `block` con el promedio de los
+    valores no NaN de esa fila. Las filas sin ningún valor válido quedan en NaN.
+    """
+    # Un promedio por fila, inicializado en NaN (arreglo local: la función es reentrante)
+    row_means = np.full(block.shape[0], np.nan, dtype=block.dtype)
+
+    # Contamos los valores válidos y dividimos solo donde hay al menos uno: si todos
+    # los valores de una fila están perdidos no podemos imputar y los NaN permanecerán.
+    mask = np.isnan(block)
+    valid_count = block.shape[1] - mask.sum(axis=1)
+    sums = np.where(mask, 0.0, block).sum(axis=1)
+    np.divide(sums, valid_count, out=row_means, where=valid_count > 0)
+
+    # Copia el promedio de cada fila solo en sus posiciones NaN, sin arreglos temporales
+    np.copyto(block, row_means[:, None], where=mask)
+
+# Kernel de Numba, compilado la primera vez que se pide (ver `_get_numba_kernel`)
+_NUMBA_KERNEL = None
+
+def _get_numba_kernel():
+    """
+    Devuelve el kernel de Numba que rellena las filas del bloque, compilándolo la
+    primera vez. Numba es opcional y solo se importa aquí; si no está instalado
+    devuelve None.
+    """
+    global _NUMBA_KERNEL
+    if _NUMBA_KERNEL is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            return None
+
+        # No se usa fastmath: asume que no hay NaN y podría eliminar las comprobaciones np.isnan
+        @njit(parallel=True, cache=True)
+        def fill_row_means_numba(block):
+            """
+            Equivalente a `_fill_row_means_numpy`, pero calcula el promedio y rellena
+            cada fila en una sola pasada sobre el bloque, sin arreglos temporales.
+            """
+            num_rows, num_cols = block.shape
+            for i in prange(num_rows):
+                row_sum = 0.0
+                valid_count = 0
+                for j in range(num_cols):
+                    value = block[i, j]
+                    if not np.isnan(value):
+                        row_sum += value
+                        valid_count += 1
+
+                if valid_count > 0:
+                    row_mean = row_sum / valid_count
+                    for j in range(num_cols):
+                        if np.isnan(block[i, j]):
+                            block[i, j] = row_mean
+
+        _NUMBA_KERNEL = fill_row_means_numba
+    return _NUMBA_KERNEL
+
+def fill_missing_irradiance_data(df: pd.DataFrame, verbose: bool = False,
+                                 use_numba: bool = False) -> pd.DataFrame:
     """
     Completa los datos perdidos (NaN) en las columnas de irradiancia
     utilizando el promedio de los valores existentes para el mismo intervalo
@@ -12,6 +73,12 @@ def fill_missing_irradiance_data(df: pd.DataFrame) -> pd.DataFrame:
                           y columnas de años (ej., 2013, 2014, ...).
                           Se asume que los valores de irradiancia están en las
                           columnas de los años.
+        verbose (bool): Si es True, imprime las columnas identificadas y el número
+                        de valores NaN antes y después de la imputación.
+        use_numba (bool): Si es True y Numba está instalado, rellena con un kernel
+                          compilado en paralelo. Solo compensa con bloques muy grandes
+                          (más grandes que la caché L3); la primera llamada incluye la
+                          compilación. Por defecto se usa la versión con NumPy.
 
     Returns:
         pd.DataFrame: Un nuevo DataFrame con los valores NaN en las columnas
@@ -25,31 +92,34 @@ def fill_missing_irradiance_data(df: pd.DataFrame) -> pd.DataFrame:
     # y que sus nombres son los años.
     irradiance_cols = df_filled.columns[2:]
 
-    print(f"Columnas de irradiancia identificadas: {list(irradiance_cols)}")
-    print(f"Número inicial de valores NaN en las columnas de irradiancia: {df_filled[irradiance_cols].isnull().sum().sum()}")
-
-    # Iterar sobre cada fila (intervalo de tiempo de 5 minutos en un día)
-    # Para cada fila, calculamos el promedio de los valores existentes en esa fila
-    # a través de los diferentes años, y usamos ese promedio para llenar los NaN
-    # en esa misma fila.
-    for index, row in df_filled.iterrows():
-        # Seleccionar solo los valores de irradiancia para la fila actual
-        irradiance_values_in_row = row[irradiance_cols]
-
-        # Calcular el promedio de los valores no NaN en esa fila (intervalo de tiempo)
-        # np.nanmean ignora los NaN al calcular el promedio
-        row_mean = np.nanmean(irradiance_values_in_row)
-
-        # Si el promedio es NaN (lo que significa que todos los valores para ese
-        # intervalo de tiempo en todos los años están perdidos), no podemos imputar.
-        # En ese caso, el NaN permanecerá.
-        if not np.isnan(row_mean):
-            # Llenar los NaN en la fila actual con el promedio calculado
-            df_filled.loc[index, irradiance_cols] = row[irradiance_cols].fillna(row_mean)
-        # else:
-            # print(f"Advertencia: Todos los datos para el intervalo de tiempo en la fila {index} son NaN. No se pudo imputar.")
-
-    print(f"Número final de valores NaN en las columnas de irradiancia: {df_filled[irradiance_cols].isnull().sum().sum()}")
+    if verbose:
+        print(f"Columnas de irradiancia identificadas: {list(irradiance_cols)}")
+
+    # En lugar de iterar fila por fila (intervalo de tiempo de 5 minutos en un día),
+    # extraemos el bloque de irradiancia como un arreglo 2D de NumPy y calculamos
+    # de una sola vez el promedio de cada fila a través de los diferentes años.
+    # pandas entrega el bloque en orden de columnas (Fortran); lo pasamos a orden de
+    # filas (C) para que cada reducción por fila recorra memoria contigua. La copia
+    # explícita garantiza un arreglo modificable: to_numpy() puede devolver una vista
+    # de solo lectura (ej., con una sola columna de año), que ya está en orden C.
+    block = np.array(df_filled[irradiance_cols].to_numpy(dtype=np.float32), order='C', copy=True)
+
+    # Los conteos de NaN se hacen directamente sobre el arreglo de NumPy, y solo si se piden
+    if verbose:
+        print(f"Número inicial de valores NaN en las columnas de irradiancia: {int(np.isnan(block).sum())}")
+
+    # Llenar los NaN de cada fila con el promedio de los valores existentes en esa fila
+    numba_kernel = _get_numba_kernel() if use_numba else None
+    if numba_kernel is not None:
+        numba_kernel(block)
+    else:
+        _fill_row_means_numpy(block)
+
+    # Escribir el bloque completado de vuelta en el DataFrame una sola vez
+    df_filled[irradiance_cols] = block
+
+    if verbose:
+        print(f"Número final de valores NaN en las columnas de irradiancia: {int(np.isnan(block).sum())}")
     return df_filled
 
 # --- Ejemplo de Uso ---
@@ -71,7 +141,7 @@ if __name__ == "__main__":
     print("\nValores NaN antes de la imputación:\n", sample_df.isnull().sum())
 
     # --- 2. Aplicar la función para completar los datos ---
-    filled_df = fill_missing_irradiance_data(sample_df)
+    filled_df = fill_missing_irradiance_data(sample_df, verbose=True)
 
     print("\n--- DataFrame de Ejemplo Después de la Imputación ---")
     print(filled_df)
@@ -86,6 +156,7 @@ if __name__ == "__main__":
     #
     # 2. Aplicar la función:
     #    df_irradiancia_limpio = fill_missing_irradiance_data(your_df)
+    #    (usa verbose=True para ver el número de NaN antes y después de la imputación)
     #
     # 3. Manejo de casos sin datos:
     #    Si una fila completa de datos de irradiancia (para un intervalo de tiempo específico)
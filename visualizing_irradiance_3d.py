@@ -1,22 +1,41 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
+from matplotlib.lines import Line2D
 from mpl_toolkits.mplot3d import Axes3D # Necesario para gráficos 3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+from convert_excel_to_parquet import is_parquet_up_to_date, parquet_path
 
 # --- Configuración global ---
 # Ruta del archivo Excel. Considera usar una ruta relativa para GitHub.
 # Por ejemplo: 'data/Proccess_irradiance_data_2013_2023.xlsx'
 EXCEL_FILE_PATH = "Proccess_irradiance_data_2013_2023.xlsx"
-SHEET_NAME = "Enero"
-OUTPUT_FILENAME = "irradiance_behaviour_3d.png"
+# Hojas mensuales del libro; cada una se procesa en paralelo en su propio proceso
+MONTH_SHEETS = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio",
+                "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+OUTPUT_FILENAME = "irradiance_behaviour_3d_{sheet_name}.png"
 OUTPUT_DPI = 300 # Resolución de la imagen (puntos por pulgada)
+# Compresión PNG rápida (nivel 1 en lugar de 6): archivos algo más grandes, pero guardar
+# cada imagen a 300 DPI es mucho más rápido. Si el tamaño importa, comprimir después (ej., pngcrush).
+OUTPUT_PNG_OPTIONS = {'optimize': False, 'compress_level': 1}
+
+# Divide los trazos largos en bloques al renderizar con Agg (miles de puntos por línea)
+plt.rcParams['agg.path.chunksize'] = 10000
+
+# Paletas de colores por número de años, reutilizadas entre gráficos (ej., varias hojas mensuales)
+_YEAR_COLORS_CACHE = {}
 
 # --- Funciones ---
 
 def load_and_preprocess_data(file_path: str, sheet_name: str) -> tuple:
     """
-    Carga los datos de irradiancia desde un archivo Excel y realiza un preprocesamiento inicial.
+    Carga los datos de irradiancia desde un archivo Excel (o su copia en Parquet, si existe)
+    y realiza un preprocesamiento inicial.
 
     Args:
         file_path (str): Ruta al archivo Excel.
@@ -25,44 +44,63 @@ def load_and_preprocess_data(file_path: str, sheet_name: str) -> tuple:
     Returns:
         tuple: Una tupla que contiene:
             - time (pd.Series): Serie de tiempo de la primera cuarta parte de los datos.
-            - irradiance_data (pd.DataFrame): DataFrame de irradiancia de la primera cuarta parte.
+            - irradiance_arr (np.ndarray): Arreglo (tiempo x años) de irradiancia de la primera
+              cuarta parte, en float32.
             - years (pd.Index): Nombres de las columnas de los años.
             - num_time_points (int): Número de puntos de tiempo en la porción seleccionada.
             - num_years (int): Número de años en el dataset.
+
+    Raises:
+        FileNotFoundError: Si el archivo Excel no existe.
+        RuntimeError: Si la hoja no se puede leer (ej., no existe en el libro).
     """
+    # Si la hoja ya fue convertida con convert_excel_to_parquet.py, se lee desde Parquet,
+    # que es mucho más rápido que interpretar el XML del Excel en cada ejecución. Si el
+    # Excel se modificó después de la conversión, se vuelve a leer el Excel.
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-    except FileNotFoundError:
-        print(f"Error: El archivo '{file_path}' no se encontró. Asegúrate de que la ruta sea correcta.")
-        exit()
+        if is_parquet_up_to_date(file_path, sheet_name):
+            df = pd.read_parquet(parquet_path(sheet_name))
+            # Descartar la segunda columna (el día), igual que al leer el Excel
+            df = df.iloc[:, [0, *range(2, df.shape[1])]]
+        else:
+            with pd.ExcelFile(file_path, engine='openpyxl') as excel_file:
+                # Leer primero solo la fila de encabezados para conocer las columnas de años
+                header = excel_file.parse(sheet_name, nrows=0).columns
+                # Leer solo el tiempo (primera columna) y los años (desde la tercera), y
+                # convertir los años directamente a float32; el tiempo conserva el tipo inferido.
+                df = excel_file.parse(sheet_name, usecols=[0, *range(2, len(header))],
+                                      dtype={year: np.float32 for year in header[2:]})
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"El archivo '{file_path}' no se encontró. "
+                                "Asegúrate de que la ruta sea correcta.") from e
     except Exception as e:
-        print(f"Error al leer el archivo Excel: {e}")
-        exit()
+        raise RuntimeError(f"Error al leer la hoja '{sheet_name}' del archivo Excel: {e}") from e
 
-    # La primera columna es el tiempo, las columnas de irradiancia comienzan desde la tercera.
+    # La primera columna es el tiempo y el resto son las columnas de irradiancia (sin el día).
     time_full = df.iloc[:, 0]
-    irradiance_data_full = df.iloc[:, 2:]
-    years = irradiance_data_full.columns # Los nombres de las columnas son los años
+    years = df.columns[1:] # Los nombres de las columnas son los años
 
-    # Seleccionar la primera cuarta parte de los datos para visualización
+    # Seleccionar la primera cuarta parte de los datos para visualización. La irradiancia
+    # se devuelve como un arreglo de NumPy (el gráfico no necesita nada más de pandas) en
+    # float32: valores < ~1500 W/m² no necesitan la precisión de float64.
     num_rows = len(df)
     quarter_rows = num_rows // 4
     time = time_full[:quarter_rows]
-    irradiance_data = irradiance_data_full.iloc[:quarter_rows, :]
+    irradiance_arr = df.iloc[:quarter_rows, 1:].to_numpy(dtype=np.float32, copy=False)
 
     num_time_points = len(time)
     num_years = len(years)
 
-    return time, irradiance_data, years, num_time_points, num_years
+    return time, irradiance_arr, years, num_time_points, num_years
 
-def create_3d_irradiance_plot(time_points: pd.Series, irradiance_df: pd.DataFrame,
+def create_3d_irradiance_plot(time_points: pd.Series, irradiance_arr: np.ndarray,
                              years_labels: pd.Index, num_time_points: int, num_years: int) -> plt.Figure:
     """
     Crea un gráfico 3D del comportamiento de la irradiancia a lo largo de los años.
 
     Args:
         time_points (pd.Series): Puntos de tiempo para el eje Y.
-        irradiance_df (pd.DataFrame): Datos de irradiancia por año.
+        irradiance_arr (np.ndarray): Datos de irradiancia (tiempo x años).
         years_labels (pd.Index): Etiquetas de los años para el eje X.
         num_time_points (int): Número de puntos de tiempo.
         num_years (int): Número de años.
@@ -87,23 +125,33 @@ def create_3d_irradiance_plot(time_points: pd.Series, irradiance_df: pd.DataFram
     # Elimina la cuadrícula del gráfico
     ax.grid(False)
 
-    # Define una paleta de colores para las líneas de los años
-    colors = sns.color_palette("inferno", n_colors=num_years)
+    # Define una paleta de colores para las líneas de los años. Se muestrea el mapa
+    # "inferno" sin sus extremos, igual que sns.color_palette("inferno", n_colors=num_years).
+    if num_years not in _YEAR_COLORS_CACHE:
+        _YEAR_COLORS_CACHE[num_years] = plt.get_cmap("inferno")(np.linspace(0, 1, num_years + 2)[1:-1])
+    colors = _YEAR_COLORS_CACHE[num_years]
 
-    # Graficar las líneas para cada año
+    # Graficar las líneas de todos los años como un solo artista (Line3DCollection)
     # En el gráfico 3D (x, y, z):
     # x: Representa el índice del año (para separar las líneas)
     # y: Representa los puntos de tiempo
     # z: Representa los valores de irradiancia
     x_plot_coords = np.arange(num_time_points) # Coordenadas para el eje 'Time' del plot
 
-    for i, year in enumerate(years_labels):
-        z_irradiance = irradiance_df[year].values # Valores de irradiancia para el año actual
-        y_year_index = np.full(num_time_points, i) # Índice del año para el eje 'Year' del plot
+    # Se fuerza el orden por columnas (Fortran) para que cada año sea un tramo contiguo
+    z_all = np.asfortranarray(irradiance_arr)
 
-        # Grafica la línea 3D
-        ax.plot(y_year_index, x_plot_coords, z_irradiance,
-                linestyle='-', linewidth=0.5, color=colors[i], label=year)
+    # Un segmento (polilínea) por año: (índice del año, tiempo, irradiancia)
+    segments = [np.column_stack([np.full(num_time_points, i), x_plot_coords, z_all[:, i]])
+                for i in range(num_years)]
+
+    # Agrega todas las líneas 3D de una vez (rasterizadas: la salida es PNG, no se pierde calidad)
+    year_lines = Line3DCollection(segments, colors=colors, linewidths=0.5,
+                                  linestyles='-', rasterized=True)
+    ax.add_collection3d(year_lines)
+
+    # Una colección no ajusta los límites de los ejes por sí sola
+    ax.auto_scale_xyz([0, num_years - 1], [0, num_time_points - 1], had_data=False)
 
     # --- Personalizar las etiquetas y ticks de los ejes ---
     # Etiqueta del eje X (representa los años)
@@ -138,25 +186,58 @@ def create_3d_irradiance_plot(time_points: pd.Series, irradiance_df: pd.DataFram
 
     # --- Configuración de la leyenda ---
     # Mover la leyenda al centro superior de la figura
-    ax.legend(title="Year", loc='upper center', bbox_to_anchor=(0.5, 1.08), ncol=num_years, fontsize=8)
+    # La colección no genera entradas de leyenda, así que se crea una por año
+    legend_handles = [Line2D([], [], linestyle='-', linewidth=0.5, color=colors[i], label=year)
+                      for i, year in enumerate(years_labels)]
+    ax.legend(handles=legend_handles, title="Year", loc='upper center', bbox_to_anchor=(0.5, 1.08), ncol=num_years, fontsize=8)
 
     plt.tight_layout() # Ajusta el diseño para evitar recortes
 
     return fig
 
-# --- Bloque principal de ejecución ---
-if __name__ == "__main__":
+def process_sheet(sheet_name: str) -> str:
+    """
+    Carga una hoja mensual, crea su gráfico 3D y lo guarda como imagen.
+
+    Args:
+        sheet_name (str): Nombre de la hoja a procesar (ej., "Enero").
+
+    Returns:
+        str: Ruta de la imagen guardada.
+    """
     # 1. Cargar y preprocesar los datos
-    time_data, irradiance_df_processed, years_labels, num_time_points, num_years = \
-        load_and_preprocess_data(EXCEL_FILE_PATH, SHEET_NAME)
+    time_data, irradiance_arr, years_labels, num_time_points, num_years = \
+        load_and_preprocess_data(EXCEL_FILE_PATH, sheet_name)
 
     # 2. Crear el gráfico 3D
-    fig = create_3d_irradiance_plot(time_data, irradiance_df_processed,
+    fig = create_3d_irradiance_plot(time_data, irradiance_arr,
                                     years_labels, num_time_points, num_years)
 
-    # 3. Guardar la imagen con alta resolución y transparencia
-    plt.savefig(OUTPUT_FILENAME, dpi=OUTPUT_DPI, bbox_inches='tight', transparent=True)
-    print(f"Gráfico guardado como '{OUTPUT_FILENAME}' con {OUTPUT_DPI} DPI.")
+    # 3. Guardar la imagen con alta resolución y transparencia, y liberar la figura
+    output_filename = OUTPUT_FILENAME.format(sheet_name=sheet_name)
+    fig.savefig(output_filename, dpi=OUTPUT_DPI, bbox_inches='tight', transparent=True,
+                pil_kwargs=OUTPUT_PNG_OPTIONS)
+    plt.close(fig)
+
+    return output_filename
 
-    # 4. Mostrar el gráfico
-    plt.show()
+# --- Bloque principal de ejecución ---
+if __name__ == "__main__":
+    # Las hojas son independientes entre sí: se procesan todas a la vez, una por proceso
+    max_workers = min(len(MONTH_SHEETS), os.cpu_count() or 1)
+    failed_sheets = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(process_sheet, sheet_name): sheet_name for sheet_name in MONTH_SHEETS}
+        # Un error en una hoja no detiene las demás: se registra y se sigue con el resto
+        for future in as_completed(futures):
+            sheet_name = futures[future]
+            try:
+                output_filename = future.result()
+            except Exception as e:
+                print(f"Error al procesar la hoja '{sheet_name}': {e}")
+                failed_sheets.append(sheet_name)
+            else:
+                print(f"Gráfico guardado como '{output_filename}' con {OUTPUT_DPI} DPI.")
+
+    if failed_sheets:
+        sys.exit(f"No se pudieron procesar {len(failed_sheets)} hoja(s): {', '.join(failed_sheets)}")